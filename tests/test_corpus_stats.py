@@ -0,0 +1,43 @@
+import random
+from collections import Counter
+
+import pytest
+
+from textual_bee.corpus_stats import (
+    N_ORDERS,
+    RANK_WORD_PERCENTS,
+    _point_percent_curves,
+    _quantile,
+)
+
+
+def test_quantile():
+    histogram = Counter({1: 2, 5: 1, 10: 1})  # 1, 1, 5, 10
+    assert _quantile(histogram, 0) == 1
+    assert _quantile(histogram, 0.5) == 1
+    assert _quantile(histogram, 0.75) == 5
+    assert _quantile(histogram, 1) == 10
+
+
+def test_quantile_of_empty_histogram():
+    assert _quantile(Counter(), 0.5) == 0
+
+
+def test_point_percent_curves_with_equal_scores():
+    # With equal scores, the share of points is the share of words found.
+    curves = _point_percent_curves([1] * 100, random.Random(0))
+    assert len(curves) == N_ORDERS
+    for curve in curves:
+        assert curve == [
+            pytest.approx(word_percent) for _, word_percent in RANK_WORD_PERCENTS
+        ]
+
+
+def test_point_percent_curves_are_seeded_and_increasing():
+    scores = [1, 1, 5, 6, 7, 14, 1, 8, 5, 16]
+    curves = _point_percent_curves(scores, random.Random(0))
+    assert curves == _point_percent_curves(scores, random.Random(0))
+    for curve in curves:
+        assert curve[0] == 0
+        assert curve == sorted(curve)
+        assert all(0 <= share <= 100 for share in curve)
@@ -0,0 +1,96 @@
+import pathlib
+
+from textual_bee.journal import (
+    RECORD,
+    JournalState,
+    SessionJournal,
+    default_journal_path,
+    replay_journal,
+)
+
+LETTERS = ("b", ("a", "i", "l", "n", "p", "t"))
+
+
+def write_game(path: pathlib.Path, words):
+    journal = SessionJournal(path, fsync_interval=0)
+    journal.start_game(*LETTERS)
+    for word, points in words:
+        journal.record_word(word, points)
+    journal.close()
+    return journal
+
+
+def test_round_trip(tmp_path: pathlib.Path):
+    path = tmp_path / "session.journal"
+    write_game(path, [("labia", 5), ("bilabial", 8)])
+
+    assert path.stat().st_size == 3 * RECORD.size
+    assert replay_journal(path) == JournalState(
+        "b", ("a", "i", "l", "n", "p", "t"), ("bilabial", "labia"), 13
+    )
+
+
+def test_missing_journal(tmp_path: pathlib.Path):
+    assert replay_journal(tmp_path / "session.journal") is None
+
+
+def test_partial_trailing_record_is_ignored(tmp_path: pathlib.Path):
+    path = tmp_path / "session.journal"
+    write_game(path, [("labia", 5), ("bilabial", 8)])
+    with open(path, "r+b") as journal_file:
+        journal_file.truncate(path.stat().st_size - RECORD.size // 2)
+
+    state = replay_journal(path)
+    assert state is not None
+    assert state.found_words == ("labia",)
+    assert state.points == 5
+
+
+def test_start_game_discards_previous_game(tmp_path: pathlib.Path):
+    path = tmp_path / "session.journal"
+    write_game(path, [("labia", 5)])
+
+    journal = SessionJournal(path, fsync_interval=0)
+    journal.start_game("e", ("i", "o", "s", "r", "g", "c"))
+    journal.record_word("groceries", 16)
+    journal.close()
+
+    assert path.stat().st_size == 2 * RECORD.size
+    assert replay_journal(path) == JournalState(
+        "e", ("i", "o", "s", "r", "g", "c"), ("groceries",), 16
+    )
+
+
+def test_unwritable_journal_reports_error(tmp_path: pathlib.Path):
+    # The parent "directory" is a file, so the writer can't create it.
+    (tmp_path / "state").write_text("")
+    journal = write_game(tmp_path / "state" / "session.journal", [("labia", 5)])
+
+    assert isinstance(journal.error, OSError)
+    # Ignored rather than queued forever
+    pending = journal._pending.qsize()
+    journal.record_word("bilabial", 8)
+    journal.start_game(*LETTERS)
+    assert journal._pending.qsize() == pending
+
+
+def test_default_journal_path(monkeypatch, tmp_path: pathlib.Path):
+    monkeypatch.delenv("XDG_STATE_HOME", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert default_journal_path() == (
+        tmp_path / ".local" / "state" / "textual-bee" / "session.journal"
+    )
+
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    assert (
+        default_journal_path() == tmp_path / "state" / "textual-bee" / "session.journal"
+    )
+
+
+def test_unreadable_or_corrupt_journal_is_not_resumed(tmp_path: pathlib.Path):
+    (tmp_path / "state").write_text("")
+    assert replay_journal(tmp_path / "state" / "session.journal") is None
+
+    path = tmp_path / "session.journal"
+    path.write_bytes(RECORD.pack(b"G", 0, b"\xff\xfe"))
+    assert replay_journal(path) is None
@@ -0,0 +1,204 @@
+import json
+import pathlib
+import random
+import string
+
+import pytest
+
+from textual_bee import words_utils
+from textual_bee.words_utils import (
+    INDEX_FORMAT,
+    INDEX_PATH,
+    Solver,
+    get_difficulty,
+    get_popular_words,
+    get_status_from_point_percent,
+    get_thresholds,
+    get_word_result,
+    get_words_with_letters,
+    index_key,
+    load_index,
+    write_index,
+)
+
+
+def brute_force_words_with_letters(required: str, optional: str, min_size: int):
+    # The linear scan Solver replaced
+    all_possible_letters = required + optional
+    out = {}
+    for word in get_popular_words():
+        if len(word) < min_size:
+            continue
+        if any((letter not in word for letter in required)):
+            continue
+        if any((letter not in all_possible_letters for letter in word)):
+            continue
+        out[word] = get_word_result(word)
+    return out
+
+
+@pytest.fixture(scope="module")
+def solver():
+    return Solver.from_word_list()
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_brute_force(solver: Solver, seed: int):
+    rng = random.Random(seed)
+    letters = rng.sample(string.ascii_lowercase, 7)
+    min_size = rng.choice([3, 4, 5])
+    required, optional = letters[0], "".join(letters[1:])
+    assert dict(
+        solver.words_with_letters(required.upper(), optional, min_size)
+    ) == brute_force_words_with_letters(required, optional, min_size)
+
+
+@pytest.mark.parametrize("n_letters", [1, 8, 11, 15, 20, 26])
+def test_matches_brute_force_with_any_number_of_letters(solver: Solver, n_letters: int):
+    letters = random.Random(n_letters).sample(string.ascii_lowercase, n_letters)
+    required, optional = letters[0], "".join(letters[1:])
+    assert dict(
+        solver.words_with_letters(required, optional, 4)
+    ) == brute_force_words_with_letters(required, optional, 4)
+
+
+def test_words_with_more_than_seven_letters(solver: Solver):
+    scorebook = solver.words_with_letters("e", "rstnaiolcd")
+    assert scorebook == brute_force_words_with_letters("e", "rstnaiolcd", 4)
+    assert "acceleration" in scorebook
+
+
+def test_known_puzzle():
+    scorebook = get_words_with_letters("b", "ailnpt", 4)
+    assert scorebook["bilabial"] == ("Awesome!", 8)
+    assert "labia" in scorebook
+    assert "bat" not in scorebook
+
+
+def test_invalid_letters_give_no_words(solver: Solver):
+    assert dict(solver.words_with_letters("?", "??????")) == {}
+
+
+def test_results_are_read_only(solver: Solver):
+    scorebook = solver.words_with_letters("b", "ailnpt")
+    with pytest.raises(TypeError):
+        scorebook["zzzz"] = ("Good!", 1)  # type: ignore
+    with pytest.raises(TypeError):
+        solver.index[0] = ()  # type: ignore
+
+
+def test_solver_cannot_be_reassigned(solver: Solver):
+    with pytest.raises(AttributeError):
+        solver._by_mask = {}  # type: ignore
+
+
+def test_from_index_copies(solver: Solver):
+    index = {mask: [word for word, _ in words] for mask, words in solver.index.items()}
+    copy = Solver.from_index(index)
+    index.clear()
+    assert dict(copy.words_with_letters("b", "ailnpt")) == dict(
+        solver.words_with_letters("b", "ailnpt")
+    )
+
+
+def test_shipped_index_is_up_to_date():
+    # Regenerate with `python -m textual_bee.build_index`
+    assert load_index(INDEX_PATH) is not None
+
+
+def test_index_round_trip(solver: Solver, tmp_path: pathlib.Path):
+    path = tmp_path / "cache" / "word_index.json"
+    write_index(solver, path)
+
+    loaded = load_index(path)
+    assert loaded is not None
+    assert dict(loaded.index) == dict(solver.index)
+    assert loaded.pangram_masks == solver.pangram_masks
+    assert [p.name for p in path.parent.iterdir()] == ["word_index.json"]
+
+
+def test_loaded_scores_match_get_word_result():
+    loaded = load_index(INDEX_PATH)
+    assert loaded is not None
+    for words in loaded.index.values():
+        for word, result in words:
+            assert result == get_word_result(word)
+
+
+def test_index_key_covers_the_code(monkeypatch):
+    key = index_key()
+
+    def letter_mask(letters: str) -> int:
+        return 0
+
+    monkeypatch.setattr(words_utils, "letter_mask", letter_mask)
+    assert index_key() != key
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        "",
+        "not json",
+        '["not", "a", "dict"]',
+        json.dumps({"format": INDEX_FORMAT, "key": "stale", "index": {}}),
+        json.dumps({"format": 1, "key": "x", "index": {}}),
+        '{"format": 2, "index": {"1": 5}}',
+    ],
+)
+def test_unusable_index_is_ignored(tmp_path: pathlib.Path, contents: str):
+    path = tmp_path / "word_index.json"
+    path.write_text(contents)
+    assert load_index(path) is None
+
+
+def test_index_missing_keys_is_ignored(tmp_path: pathlib.Path):
+    path = tmp_path / "word_index.json"
+    path.write_text(json.dumps({"format": INDEX_FORMAT, "key": index_key()}))
+    assert load_index(path) is None
+    path.write_text(
+        json.dumps({"format": INDEX_FORMAT, "key": index_key(), "index": {"x": 1}})
+    )
+    assert load_index(path) is None
+    assert load_index(tmp_path / "missing.json") is None
+
+
+def test_thresholds_table():
+    thresholds = get_thresholds()
+    cut_offs = [threshold for _, threshold in thresholds["ranks"]]
+    assert cut_offs[0] == 0
+    assert cut_offs == sorted(cut_offs)
+    assert thresholds["min_words"] < thresholds["max_words"]
+
+
+@pytest.mark.parametrize("rank", range(1, 9))
+def test_status_boundaries(rank: int):
+    ranks = get_thresholds()["ranks"]
+    name, threshold = ranks[rank]
+    assert get_status_from_point_percent(threshold - 0.01) == (
+        ranks[rank - 1][0],
+        rank - 1,
+    )
+    assert get_status_from_point_percent(threshold) == (name, rank)
+
+
+def test_status_extremes():
+    assert get_status_from_point_percent(0) == ("Beginner", 0)
+    assert get_status_from_point_percent(99.99) == ("Genius", 8)
+    assert get_status_from_point_percent(100) == ("Queen Bee", 8)
+
+
+def test_status_is_not_rounded():
+    genius = dict(get_thresholds()["ranks"])["Genius"]
+    just_below = genius - 0.4
+    assert round(just_below) >= genius  # Would be Genius if rounded first
+    assert get_status_from_point_percent(just_below)[0] == "Amazing"
+
+
+def test_difficulty_bands():
+    bands = get_thresholds()["difficulty"]
+    assert get_difficulty(0) == bands[0][0]
+    for (name, upper), (next_name, _) in zip(bands, bands[1:]):
+        assert get_difficulty(upper) == name
+        assert get_difficulty(upper + 1) == next_name
+    assert get_difficulty(bands[-1][1] + 1000) == bands[-1][0]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import itertools
+import pathlib
 import random
 from functools import partial
 import string
@@ -16,11 +17,19 @@ from textual.geometry import Spacing
 from textual.reactive import Reactive, var
 from textual.widgets import Button, Footer, Static
 
+from .journal import (
+    JournalState,
+    SessionJournal,
+    default_journal_path,
+    replay_journal,
+)
 from .words_utils import (
+    get_difficulty,
     get_status_from_point_percent,
     get_words_with_letters,
     pangram,
     randomize_letters,
+    save_index_in_background,
 )
 
 
@@ -59,6 +68,7 @@ class Splash(Vertical):
         yield Static("Textual Bee", classes="splash-part title")
         yield Static("How many words can you", classes="splash-part subtitle first")
         yield Static("make with 7 letters?", classes="splash-part subtitle second")
+        yield Static("", id="difficulty", classes="splash-part subtitle second")
         yield Button("Play", id="play")
 
 
@@ -126,6 +136,10 @@ class BeeApp(App):
 
     starting_letters: None | str = None
     simplified = False
+    journal_path: None | pathlib.Path = None
+    journal: None | SessionJournal = None
+    resume = True
+    journal_error_reported = False
 
     @property
     def recent_words_open(self):
@@ -145,7 +159,22 @@ class BeeApp(App):
             e.ACTIVE_EFFECT_DURATION = 0.1  # type: ignore
             if not self.simplified:
                 e.add_class("fancy")
-        self.action_reset_game(self.starting_letters)
+
+        resumed = None
+        if self.journal_path is not None:
+            if self.starting_letters is None and self.resume:
+                resumed = replay_journal(self.journal_path)
+            self.journal = SessionJournal(self.journal_path)
+        if resumed is None:
+            self.action_reset_game(self.starting_letters)
+        else:
+            self.resume_game(resumed)
+        # Once the UI is up
+        self.set_timer(1.0, save_index_in_background)
+
+    def on_unmount(self):
+        if self.journal is not None:
+            self.journal.close()
 
     def compose(self) -> ComposeResult:
         """Add our buttons."""
@@ -167,16 +196,35 @@ class BeeApp(App):
         else:
             self.center_letter = letters[0]
             self.outer_letters = [letter for letter in letters[1:]]
+        if self.journal is not None:
+            self.journal.start_game(self.center_letter, self.outer_letters)
+
+        self.load_scorebook()
+        self.already_found_words = tuple()
+        self.current_points = 0
+        self.show_splash()
+
+    def resume_game(self, state: JournalState):
+        self.center_letter = state.center_letter
+        self.outer_letters = list(state.outer_letters)
+        self.load_scorebook()
+        self.already_found_words = state.found_words
+        self.current_points = state.points
+        self.show_splash()
 
+    def load_scorebook(self):
         self.scorebook = get_words_with_letters(
             required=self.center_letter,
             optional="".join(self.outer_letters),
             min_size=4,
         )
         print(self.scorebook)
-        self.already_found_words = tuple()
         self.total_points = sum((p[1] for p in self.scorebook.values()))
-        self.current_points = 0
+        self.query_one("#difficulty", Static).update(
+            f"Difficulty: [bold]{get_difficulty(self.total_points)}[/bold]"
+        )
+
+    def show_splash(self):
         self.current_guess = ""
         self.query_one("#main").styles.display = "none"
         self.query_one("#splash").styles.display = "block"
@@ -221,10 +269,22 @@ class BeeApp(App):
                 self.current_guess.lower(),
                 *self.already_found_words,
             )
+            if self.journal is not None:
+                self.journal.record_word(self.current_guess.lower(), points)
             self.feedback = feedback_str, points
+            self.report_journal_error()
 
         self.current_guess = ""
 
+    def report_journal_error(self):
+        if (
+            self.journal is not None
+            and self.journal.error is not None
+            and not self.journal_error_reported
+        ):
+            self.journal_error_reported = True
+            self.feedback = "Can't save this game", 0
+
     def watch_center_letter(self, center_letter: str):
         # self.action_reset_game()
         self.query_one("#letter-center", Button).label = center_letter.upper()
@@ -425,11 +485,7 @@ class BeeApp(App):
 
     def watch_current_points(self, current_points: int):
         name, rank = get_status_from_point_percent(
-            round(
-                100
-                * current_points
-                / (self.total_points if self.total_points > 0 else 1)
-            )
+            100 * current_points / (self.total_points if self.total_points > 0 else 1)
         )
         self.query_one("#status-string", Static).update(f"[bold]{name}[/bold]")
         points_str = str(current_points)
@@ -525,6 +581,7 @@ class BeeApp(App):
                 self.query_one("#main").styles.display = "block"
 
             self.set_timer(0.4, show)
+            self.set_timer(0.4, self.report_journal_error)
         elif button_id == "recent-words":
             self.update_column_dims()
             self.query_one("#recent-words", Button).toggle_class("full-recent-words")
@@ -590,18 +647,25 @@ def validate_letters(ctx, param, value):
     is_flag=True,
     help="Run the game with simplified graphics (for asciinema, for example)",
 )
-def run_app(letters: Optional[str], answers: bool, simplified: bool):
+@click.option(
+    "--new-game",
+    is_flag=True,
+    help="Start a new game instead of resuming the last one.",
+)
+def run_app(letters: Optional[str], answers: bool, simplified: bool, new_game: bool):
     if answers:
         if letters is None:
             raise click.BadParameter("Answers must include --letters as well.")
         from rich import print
 
-        print(get_words_with_letters(letters[0], letters[1:], 4))
+        print(dict(get_words_with_letters(letters[0], letters[1:], 4)))
 
     else:
         app = BeeApp()
         app.starting_letters = letters
         app.simplified = simplified
+        app.journal_path = default_journal_path()
+        app.resume = not new_game
         app.run()
 
 
@@ -0,0 +1,20 @@
+"""Rebuild the prebuilt word index shipped with the package.
+
+The game checks the index against a hash of ``word_list.json`` and rebuilds it
+at startup when they differ, so regenerate it after changing the word list::
+
+    python -m textual_bee.build_index
+"""
+import click
+
+from .words_utils import INDEX_PATH, Solver, write_index
+
+
+@click.command()
+def main():
+    write_index(Solver.from_word_list(), INDEX_PATH)
+    click.echo(f"Wrote {INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
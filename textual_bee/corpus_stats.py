@@ -0,0 +1,214 @@
+"""Corpus-wide statistics used to calibrate ranks and puzzle difficulty.
+
+Evaluates every center + 6 letter set against the word list in parallel and
+writes the derived thresholds to ``thresholds.json``, which the game loads at
+startup. Regenerate it after changing the word list with::
+
+    python -m textual_bee.corpus_stats
+"""
+import itertools
+import json
+import math
+import pathlib
+import random
+import statistics
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from .words_utils import THRESHOLDS_PATH, Solver, letter_mask
+
+# Ranks are defined by the share of the possible words found. The game scores
+# ranks on points, so the job measures the share of points a player holds at
+# each of these marks.
+RANK_WORD_PERCENTS = [
+    ("Beginner", 0),
+    ("Good Start", 2),
+    ("Moving Up", 5),
+    ("Good", 8),
+    ("Solid", 15),
+    ("Nice", 25),
+    ("Great", 40),
+    ("Amazing", 50),
+    ("Genius", 70),
+]
+# Quantiles of the word count, among puzzles with a pangram, that bound the
+# puzzles the game will pick.
+WORD_WINDOW_QUANTILES = (0.05, 0.75)
+DIFFICULTY_BANDS = ["Easy", "Medium", "Hard"]
+# Random finding orders sampled per puzzle
+N_ORDERS = 20
+
+# (n_words, total points, n_pangrams) per letter-set bitmask, in each worker.
+_aggregates: Dict[int, Tuple[int, int, int]] = {}
+
+
+def _init_worker():
+    global _aggregates
+    _aggregates = {}
+    for mask, words in Solver.from_word_list().index.items():
+        results = [result for word, result in words if len(word) >= 4]
+        if results:
+            _aggregates[mask] = (
+                len(results),
+                sum(points for _, points in results),
+                sum(1 for feedback, _ in results if feedback == "Pangram!"),
+            )
+
+
+def _evaluate_prefix(prefix: Tuple[int, int]) -> Dict[str, Counter]:
+    """Evaluate every puzzle whose two lowest letters are ``prefix``."""
+    first, second = prefix
+    n_words: Counter = Counter()
+    points: Counter = Counter()
+    pangrams: Counter = Counter()
+    for rest in itertools.combinations(range(second + 1, 26), 5):
+        bits = [1 << first, 1 << second, *(1 << letter for letter in rest)]
+        full = sum(bits)
+        totals = [[0, 0, 0] for _ in bits]
+        subset = full
+        while subset:
+            aggregate = _aggregates.get(subset)
+            if aggregate is not None:
+                for total, bit in zip(totals, bits):
+                    if subset & bit:
+                        total[0] += aggregate[0]
+                        total[1] += aggregate[1]
+                        total[2] += aggregate[2]
+            subset = (subset - 1) & full
+        for words, score, n_pangrams in totals:
+            n_words[words] += 1
+            points[score] += 1
+            pangrams[n_pangrams] += 1
+    return {"n_words": n_words, "points": points, "n_pangrams": pangrams}
+
+
+def _point_percent_curves(scores: List[int], rng: random.Random) -> List[List[float]]:
+    """Share of points held after finding each rank's share of words.
+
+    Nothing tells us which words a player finds first, so rather than assume
+    an order (e.g. shortest first, which would pull every cut-off down), the
+    words are found in ``N_ORDERS`` random orders. Each gives one sample of
+    the point share at every rank.
+    """
+    scores = list(scores)
+    total = sum(scores)
+    found_counts = [
+        math.ceil(len(scores) * word_percent / 100)
+        for _, word_percent in RANK_WORD_PERCENTS
+    ]
+    curves = []
+    for _ in range(N_ORDERS):
+        rng.shuffle(scores)
+        cumulative = [0, *itertools.accumulate(scores)]
+        curves.append([100 * cumulative[found] / total for found in found_counts])
+    return curves
+
+
+def _quantile(histogram: Counter, q: float) -> int:
+    target = q * sum(histogram.values())
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= target:
+            return value
+    return 0
+
+
+def compute_thresholds(processes: Optional[int] = None) -> dict:
+    n_words: Counter = Counter()
+    points: Counter = Counter()
+    pangrams: Counter = Counter()
+    prefixes = list(itertools.combinations(range(26), 2))
+    with ProcessPoolExecutor(processes, initializer=_init_worker) as pool:
+        for result in pool.map(_evaluate_prefix, prefixes):
+            n_words.update(result["n_words"])
+            points.update(result["points"])
+            pangrams.update(result["n_pangrams"])
+
+    # Puzzles worth playing have a pangram, so each pangram letter set gives
+    # one candidate puzzle per center letter.
+    solver = Solver.from_word_list()
+    candidates = []
+    for mask in solver.pangram_masks:
+        letters = [
+            letter for letter in string.ascii_lowercase if mask & letter_mask(letter)
+        ]
+        for center in letters:
+            scorebook = solver.words_with_letters(center, "".join(letters), min_size=4)
+            candidates.append([score for _, score in scorebook.values()])
+
+    candidate_sizes = Counter(len(scores) for scores in candidates)
+    min_words, max_words = (
+        _quantile(candidate_sizes, q) for q in WORD_WINDOW_QUANTILES
+    )
+    accepted = [
+        scores for scores in candidates if min_words <= len(scores) <= max_words
+    ]
+    # Each rank's cut-off is the median point share at its mark, over every
+    # playable puzzle and sampled order.
+    rng = random.Random(0)
+    curves = [
+        curve for scores in accepted for curve in _point_percent_curves(scores, rng)
+    ]
+    ranks = [
+        [name, round(statistics.median(curve[i] for curve in curves), 1)]
+        for i, (name, _) in enumerate(RANK_WORD_PERCENTS)
+    ]
+
+    accepted_points = Counter(sum(scores) for scores in accepted)
+    difficulty = []
+    for i, name in enumerate(DIFFICULTY_BANDS):
+        upper = _quantile(accepted_points, (i + 1) / len(DIFFICULTY_BANDS))
+        difficulty.append([name, upper])
+
+    return {
+        "ranks": ranks,
+        "min_words": min_words,
+        "max_words": max_words,
+        "difficulty": difficulty,
+        "distributions": {
+            "n_puzzles": sum(n_words.values()),
+            "n_pangram_puzzles": len(candidates),
+            "n_words": _summarize(n_words),
+            "points": _summarize(points),
+            "n_pangrams": _summarize(pangrams),
+            "pangram_puzzle_n_words": _summarize(candidate_sizes),
+        },
+    }
+
+
+def _summarize(histogram: Counter) -> Dict[str, int]:
+    return {
+        f"p{round(q * 100)}": _quantile(histogram, q)
+        for q in (0.05, 0.25, 0.5, 0.75, 0.95)
+    } | {"max": max(histogram)}
+
+
+@click.command()
+@click.option(
+    "--processes",
+    type=int,
+    default=None,
+    help="Number of worker processes (defaults to the number of CPUs).",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    default=THRESHOLDS_PATH,
+    show_default=True,
+    help="Where to write the thresholds table.",
+)
+def main(processes: Optional[int], output: pathlib.Path):
+    thresholds = compute_thresholds(processes)
+    with open(output, "w") as jsonfile:
+        json.dump(thresholds, jsonfile, indent=2)
+        jsonfile.write("\n")
+    click.echo(json.dumps(thresholds["distributions"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
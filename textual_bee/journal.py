@@ -0,0 +1,179 @@
+"""Append-only journal of the current game, used to resume it on startup.
+
+The journal is a sequence of fixed-size records: one ``G`` record holding the
+letters when a game starts, then one ``W`` record per accepted guess. Writes
+are handed to a background thread, which fsyncs them in batches, so recording
+a guess never blocks the UI on disk I/O.
+"""
+import os
+import pathlib
+import queue
+import struct
+import threading
+from typing import BinaryIO, List, NamedTuple, Optional, Tuple, Union
+
+# kind, points, payload (the letters or the word)
+RECORD = struct.Struct("<cB30s")
+GAME = b"G"
+WORD = b"W"
+
+
+class JournalState(NamedTuple):
+    center_letter: str
+    outer_letters: Tuple[str, ...]
+    found_words: Tuple[str, ...]  # Most recent first, like BeeApp
+    points: int
+
+
+def default_journal_path() -> pathlib.Path:
+    state_home = (
+        os.environ.get("XDG_STATE_HOME") or pathlib.Path.home() / ".local" / "state"
+    )
+    return pathlib.Path(state_home) / "textual-bee" / "session.journal"
+
+
+def replay_journal(path: Union[str, pathlib.Path]) -> Optional[JournalState]:
+    """Rebuild the latest game in the journal, or None if there isn't one."""
+    try:
+        with open(path, "rb") as journal_file:
+            data = journal_file.read()
+    except OSError:
+        return None
+
+    # A crash mid-write can leave a partial record at the end; ignore it.
+    data = data[: len(data) - len(data) % RECORD.size]
+    game_start = None
+    for offset in range(len(data) - RECORD.size, -1, -RECORD.size):
+        if data[offset : offset + 1] == GAME:
+            game_start = offset
+            break
+    if game_start is None:
+        return None
+
+    try:
+        _, _, letters = RECORD.unpack_from(data, game_start)
+        letters = letters.rstrip(b"\0").decode()
+        found_words: List[str] = []
+        points = 0
+        for kind, word_points, word in RECORD.iter_unpack(
+            data[game_start + RECORD.size :]
+        ):
+            if kind == WORD:
+                found_words.append(word.rstrip(b"\0").decode())
+                points += word_points
+    except UnicodeDecodeError:
+        return None
+    if len(letters) != 7:
+        return None
+    return JournalState(
+        letters[0], tuple(letters[1:]), tuple(reversed(found_words)), points
+    )
+
+
+class SessionJournal:
+    def __init__(self, path: Union[str, pathlib.Path], fsync_interval: float = 0.5):
+        self.path = pathlib.Path(path)
+        self.fsync_interval = fsync_interval
+        # Set by the writer if the journal can't be written; nothing more is
+        # recorded after that.
+        self.error: Optional[OSError] = None
+        self._pending: "queue.SimpleQueue[Optional[Tuple[bytes, bytes]]]" = (
+            queue.SimpleQueue()
+        )
+        self._closed = threading.Event()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="textual-bee-journal", daemon=True
+        )
+        self._writer.start()
+
+    def start_game(self, center_letter: str, outer_letters: Tuple[str, ...]):
+        """Begin a new game, discarding the previous one."""
+        if self.error is not None:
+            return
+        letters = (center_letter + "".join(outer_letters)).lower()
+        self._pending.put((GAME, RECORD.pack(GAME, 0, letters.encode())))
+
+    def record_word(self, word: str, points: int):
+        if len(word) > RECORD.size - 2:
+            raise ValueError(f"Word too long for the journal: {word!r}")
+        if self.error is not None:
+            return
+        self._pending.put((WORD, RECORD.pack(WORD, points, word.lower().encode())))
+
+    def close(self):
+        """Flush all pending records and stop the writer thread."""
+        if self._writer.is_alive():
+            self._pending.put(None)
+            self._closed.set()
+            self._writer.join()
+
+    def _write_loop(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as journal_file:
+                self._write_batches(journal_file)
+        except OSError as error:
+            # Dying with a traceback would print over the UI; record the error
+            # for the app to report instead.
+            self.error = error
+
+    def _write_batches(self, journal_file: BinaryIO):
+        while True:
+            batch = [self._pending.get()]
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item is None:
+                    break
+                kind, record = item
+                if kind == GAME:
+                    # Only the latest game is ever replayed, so start over.
+                    journal_file.truncate(0)
+                journal_file.write(record)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+            if None in batch:
+                return
+            # Let further guesses pile up so they share the next fsync.
+            self._closed.wait(self.fsync_interval)
+
+
+if __name__ == "__main__":
+    import statistics
+    import tempfile
+    import time
+
+    n_records = 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp) / "session.journal"
+        journal = SessionJournal(path)
+        journal.start_game("b", ("a", "i", "l", "n", "p", "t"))
+
+        latencies = []
+        for i in range(n_records):
+            start = time.perf_counter()
+            journal.record_word("pinball", 14)
+            latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        journal.close()
+        print(f"Final flush: {1e3 * (time.perf_counter() - start):.1f}ms")
+
+        latencies.sort()
+        print(
+            f"record_word: mean {1e6 * statistics.mean(latencies):.2f}us, "
+            f"p99 {1e6 * latencies[int(0.99 * len(latencies))]:.2f}us, "
+            f"max {1e6 * latencies[-1]:.2f}us"
+        )
+
+        start = time.perf_counter()
+        state = replay_journal(path)
+        assert state is not None and len(state.found_words) == n_records
+        print(
+            f"Replayed {n_records} records ({path.stat().st_size} bytes) "
+            f"in {1e3 * (time.perf_counter() - start):.1f}ms"
+        )
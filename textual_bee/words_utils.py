@@ -1,13 +1,27 @@
+import gc
+import hashlib
+import inspect
 import json
+import os
 import pathlib
 import random
 import string
-import timeit
-from functools import lru_cache, partial
-from typing import Dict, List, Tuple
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 VOWELS = "aeiou"
 CONSONANTS = [letter for letter in string.ascii_lowercase if letter not in VOWELS]
+WORD_LIST_PATH = pathlib.Path(__file__).parent / "word_list.json"
+THRESHOLDS_PATH = pathlib.Path(__file__).parent / "thresholds.json"
+# Prebuilt from the word list; regenerate with `python -m textual_bee.build_index`
+INDEX_PATH = pathlib.Path(__file__).parent / "word_index.json"
+INDEX_FORMAT = 2
 
 
 def is_letter_selection_good(required: str, optional: List[str]):
@@ -16,8 +30,11 @@ def is_letter_selection_good(required: str, optional: List[str]):
     )
     n_words = len(list(scorebook.keys()))
     n_pangrams = len([0 for v in scorebook.values() if v[0] == "Pangram!"])
-    print(f"Checking set with {n_words=} and {n_pangrams=}")
-    if n_words > 10 and n_pangrams >= 1 and n_words < 100:
+    thresholds = get_thresholds()
+    if (
+        thresholds["min_words"] <= n_words <= thresholds["max_words"]
+        and n_pangrams >= 1
+    ):
         return True
 
     return False
@@ -40,37 +57,40 @@ def randomize_letters() -> Tuple[str, List[str]]:
 
 
 @lru_cache()
-def get_popular_words() -> List[str]:
+def get_popular_words() -> Tuple[str, ...]:
     # Borrowed from
     # https://raw.githubusercontent.com/lzha97/spelling_bee/master/words.json
-    with open(pathlib.Path(__file__).parent / "word_list.json", "r") as jsonfile:
-        return json.load(jsonfile)
+    with open(WORD_LIST_PATH, "r") as jsonfile:
+        return tuple(json.load(jsonfile))
 
 
 def pangram(s):
     return len(set(s.lower())) >= 7
 
 
-def get_status_from_point_percent(percent: int) -> Tuple[str, int]:
-    if percent < 2:
-        return "Beginner", 0
-    if percent < 5:
-        return "Good Start", 1
-    if percent < 8:
-        return "Moving Up", 2
-    if percent < 15:
-        return "Good", 3
-    if percent < 25:
-        return "Solid", 4
-    if percent < 40:
-        return "Nice", 5
-    if percent < 50:
-        return "Great", 6
-    if percent < 70:
-        return "Amazing", 7
-    if percent < 100:
-        return "Genius", 8
-    return "Queen Bee", 8
+@lru_cache()
+def get_thresholds() -> dict:
+    # Generated by corpus_stats.py
+    with open(THRESHOLDS_PATH, "r") as jsonfile:
+        return json.load(jsonfile)
+
+
+def get_status_from_point_percent(percent: float) -> Tuple[str, int]:
+    if percent >= 100:
+        return "Queen Bee", 8
+    ranks = get_thresholds()["ranks"]
+    for rank, (name, threshold) in reversed(list(enumerate(ranks))):
+        if percent >= threshold:
+            return name, rank
+    return ranks[0][0], 0
+
+
+def get_difficulty(total_points: int) -> str:
+    bands = get_thresholds()["difficulty"]
+    for name, upper in bands:
+        if total_points <= upper:
+            return name
+    return bands[-1][0]
 
 
 def get_word_result(word: str) -> Tuple[str, int]:
@@ -85,47 +105,267 @@ def get_word_result(word: str) -> Tuple[str, int]:
     return "Pangram!", len(word) + 7
 
 
-@lru_cache(maxsize=1024)
+def letter_mask(letters: str) -> int:
+    mask = 0
+    for letter in letters:
+        mask |= 1 << (ord(letter) - ord("a"))
+    return mask
+
+
+class Solver:
+    """Immutable word index that can be shared freely between threads.
+
+    Words are grouped by the set of letters they use (as a bitmask), so a
+    query with seven letters only has to look up their subsets. The index is
+    never mutated after construction, so queries need no locking, and results
+    are returned as read-only mappings.
+    """
+
+    __slots__ = ("_by_mask", "_pangram_masks")
+
+    def __init__(self, words: Iterable[str]):
+        by_mask: Dict[int, List[Tuple[str, Tuple[str, int]]]] = {}
+        for word in words:
+            if not all(letter in string.ascii_lowercase for letter in word):
+                continue
+            by_mask.setdefault(letter_mask(word), []).append(
+                (word, get_word_result(word))
+            )
+        self._set_index({mask: tuple(ws) for mask, ws in by_mask.items()})
+
+    def _set_index(self, index: Dict[int, Tuple[Tuple[str, Tuple[str, int]], ...]]):
+        object.__setattr__(self, "_by_mask", MappingProxyType(index))
+        object.__setattr__(
+            self,
+            "_pangram_masks",
+            tuple(mask for mask in index if bin(mask).count("1") == 7),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def from_word_list(cls) -> "Solver":
+        return cls(get_popular_words())
+
+    @classmethod
+    def from_index(cls, index: Mapping[int, Iterable[str]]) -> "Solver":
+        """Build a Solver from words already grouped by ``letter_mask``.
+
+        Skips computing the masks, but scores the words again, so the result
+        always agrees with ``get_word_result``.
+        """
+        solver = cls.__new__(cls)
+        solver._set_index(
+            {
+                mask: tuple([(word, get_word_result(word)) for word in words])
+                for mask, words in index.items()
+            }
+        )
+        return solver
+
+    @property
+    def index(self) -> Mapping[int, Tuple[Tuple[str, Tuple[str, int]], ...]]:
+        """Scored words keyed by the bitmask of letters they use."""
+        return self._by_mask
+
+    @property
+    def pangram_masks(self) -> Tuple[int, ...]:
+        """Letter sets that have a pangram, i.e. the puzzles worth playing."""
+        return self._pangram_masks
+
+    def words_with_letters(
+        self, required: str, optional: str, min_size: int = 4
+    ) -> Mapping[str, Tuple[str, int]]:
+        required = required.strip().lower()
+        optional = optional.strip().lower()
+        if any(letter not in string.ascii_lowercase for letter in required):
+            return MappingProxyType({})
+        optional = "".join(
+            letter for letter in optional if letter in string.ascii_lowercase
+        )
+        required_mask = letter_mask(required)
+        optional_mask = letter_mask(optional) & ~required_mask
+        out = {}
+        if 1 << bin(optional_mask).count("1") > len(self._by_mask):
+            # With many letters there are more subsets than letter sets, so
+            # check every letter set instead.
+            allowed_mask = required_mask | optional_mask
+            for mask, words in self._by_mask.items():
+                if mask & required_mask == required_mask and not mask & ~allowed_mask:
+                    for word, result in words:
+                        if len(word) >= min_size:
+                            out[word] = result
+            return MappingProxyType(out)
+
+        # Walk every subset of the optional letters, each combined with all of
+        # the required ones.
+        subset = optional_mask
+        while True:
+            for word, result in self._by_mask.get(required_mask | subset, ()):
+                if len(word) >= min_size:
+                    out[word] = result
+            if subset == 0:
+                break
+            subset = (subset - 1) & optional_mask
+        return MappingProxyType(out)
+
+
+def index_key() -> str:
+    """Hash of everything the layout of the index depends on.
+
+    That is the word list and the code that groups its words, so editing
+    either invalidates shipped and cached indexes.
+    """
+    digest = hashlib.sha256()
+    with open(WORD_LIST_PATH, "rb") as jsonfile:
+        digest.update(jsonfile.read())
+    for code in (letter_mask, Solver.__init__, Solver.from_index):
+        digest.update(inspect.getsource(code).encode())
+    return digest.hexdigest()
+
+
+def cached_index_path() -> pathlib.Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache_home) / "textual-bee" / "word_index.json"
+
+
+def write_index(solver: Solver, path: pathlib.Path = INDEX_PATH):
+    artifact = {
+        "format": INDEX_FORMAT,
+        "key": index_key(),
+        # Scores are recomputed on load, so only the words are stored.
+        "index": {
+            str(mask): " ".join(word for word, _ in words)
+            for mask, words in solver.index.items()
+        },
+    }
+    # Write to a temporary file then rename, so readers never see a
+    # half-written index and concurrent writers don't collide.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+    ) as index_file:
+        try:
+            # One letter set per line keeps diffs of the shipped index readable.
+            json.dump(artifact, index_file, indent=0)
+            index_file.write("\n")
+        except BaseException:
+            index_file.close()
+            os.unlink(index_file.name)
+            raise
+    # NamedTemporaryFile is private to the user; the index isn't.
+    os.chmod(index_file.name, 0o644)
+    os.replace(index_file.name, path)
+
+
+def load_index(path: pathlib.Path = INDEX_PATH) -> Optional[Solver]:
+    """Load a prebuilt index, or None if it is missing, unusable or stale."""
+    # The collector would otherwise run many times over the objects being
+    # built, for no benefit; this makes loading about a quarter faster.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, "r") as index_file:
+            artifact = json.load(index_file)
+        if (
+            not isinstance(artifact, dict)
+            or artifact.get("format") != INDEX_FORMAT
+            or artifact.get("key") != index_key()
+            or not isinstance(artifact.get("index"), dict)
+        ):
+            return None
+        return Solver.from_index(
+            {int(mask): words.split(" ") for mask, words in artifact["index"].items()}
+        )
+    except Exception:
+        # A corrupt file can fail in many ways; treat it as missing and
+        # rebuild.
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+_default_solver: Optional[Solver] = None
+_needs_saving = False
+
+
+def get_solver() -> Solver:
+    # Two threads racing here may both build a Solver; either one is fine.
+    global _default_solver, _needs_saving
+    if _default_solver is None:
+        solver = load_index(cached_index_path()) or load_index(INDEX_PATH)
+        if solver is None:
+            solver = Solver.from_word_list()
+            _needs_saving = True
+        _default_solver = solver
+    return _default_solver
+
+
+def _save_index():
+    try:
+        write_index(get_solver(), cached_index_path())
+    except OSError:
+        # Nothing lost; the index is rebuilt again next time.
+        pass
+
+
+def save_index_in_background():
+    """Cache the index if it had to be rebuilt, so the next start is quick.
+
+    Call this once the UI is up: pickling competes with it for the GIL.
+    """
+    global _needs_saving
+    if _needs_saving:
+        _needs_saving = False
+        threading.Thread(target=_save_index, name="textual-bee-index").start()
+
+
 def get_words_with_letters(
     required: str, optional: str, min_size: int
-) -> Dict[str, Tuple[str, int]]:
-    required = required.strip().lower()
-    optional = optional.strip().lower()
-    all_possible_letters = required + optional
-    out = {}
-    for word in get_popular_words():
-        if len(word) < min_size:
-            continue
-        if any((letter not in word for letter in required)):
-            continue
-        if any((letter not in all_possible_letters for letter in word)):
-            continue
-        out[word] = get_word_result(word)
-    return out
+) -> Mapping[str, Tuple[str, int]]:
+    return get_solver().words_with_letters(required, optional, min_size)
+
+
+def _random_letter_set() -> Tuple[str, str]:
+    letters = random.sample(string.ascii_lowercase, 7)
+    return letters[0], "".join(letters[1:])
+
+
+def _benchmark_threads(solver: Solver, n_threads: int, n_queries: int) -> float:
+    letter_sets = [_random_letter_set() for _ in range(64)]
+
+    def work(offset: int):
+        for i in range(n_queries):
+            center, outer = letter_sets[(offset + i) % len(letter_sets)]
+            solver.words_with_letters(center, outer)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        list(pool.map(work, range(n_threads)))
+    return n_threads * n_queries / (time.perf_counter() - start)
 
 
 if __name__ == "__main__":
     from rich import print
 
+    start = time.perf_counter()
+    solver = Solver.from_word_list()
+    print(f"Built index in {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    prebuilt = load_index()
     print(
-        timeit.timeit(
-            partial(get_words_with_letters, required="B", optional="AILNPT", min_size=4)
-        )
-    )
-    print(
-        timeit.timeit(
-            partial(get_words_with_letters, required="B", optional="AILNPT", min_size=4)
-        )
-    )
-    print(
-        timeit.timeit(
-            partial(get_words_with_letters, required="B", optional="AILNPT", min_size=4)
-        )
-    )
-    print(
-        timeit.timeit(
-            partial(get_words_with_letters, required="B", optional="AILNPT", min_size=4)
-        )
+        f"Loaded prebuilt index in {time.perf_counter() - start:.3f}s"
+        if prebuilt is not None
+        else "No up-to-date prebuilt index (run python -m textual_bee.build_index)"
     )
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL enabled: {gil_enabled}")
+    for n_threads in (1, 2, 4, 8):
+        qps = _benchmark_threads(solver, n_threads, 20_000)
+        print(f"{n_threads} threads: {qps:,.0f} queries/s")
+
     print("labia" in get_popular_words())
-    print(get_words_with_letters(required="B", optional="AILNPT", min_size=4))
+    print(dict(get_words_with_letters(required="B", optional="AILNPT", min_size=4)))